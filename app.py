@@ -1,21 +1,34 @@
 
+import copy
+import hashlib
 import json
 import os
-from typing import Dict, Any, Optional, List, Tuple
+import threading
+import time
+import uuid
+from collections import deque
+from typing import Callable, Dict, Any, Optional, List, Tuple
 import streamlit as st
 import pandas as pd
 import requests
 from datetime import datetime, timedelta, timezone
+from handicap import MAX_GAMES, HandicapRules, resolve_rules, evaluate_adjustments, current_handicap
 
 # ---------------- Core config ----------------
 LEAGUE_NAME = "Belfast District Snooker League"
-MAX_GAMES = 28
 LOCAL_DATA_PATH = "app_data/league.json"
+LOCAL_SEASONS_DIR = "app_data/seasons"
+DEFAULT_SEASON = "2025/26"   # season the built-in FIXTURES belong to
+FEED_MAX_ENTRIES = 500      # changes kept for sessions catching up; older sessions reload in full
+FEED_POLL_SECONDS = 10      # how often open sessions check the feed version
+JOURNAL_PATH = "app_data/journal.jsonl"
+JOURNAL_RETRY_SECONDS = (15, 30, 60, 120, 300)  # back-off between Gist attempts while it is unreachable
+JOURNAL_KEEP_IDS = 200      # applied journal entry ids remembered in the gist for de-duplication
 TEAM_CHOICES: List[str] = [
     "Ballygomartin A","Ballygomartin B","Ballygomartin C","East","Premier","QE2 A","QE2 B","Shorts"
 ]
 
-# ---------------- Fixtures (static) ----------------
+# ---------------- Fixtures (static, default season) ----------------
 FIXTURES = [
     {"week": 1, "date": "18/09/2025", "matches": [
         "Ballygomartin B v Ballygomartin A",
@@ -229,6 +242,153 @@ def inline_unlock(suffix: str):
             else:
                 st.error("Incorrect PIN.")
 
+# ---------------- Data model ----------------
+# Stored JSON is validated and normalized once, at the storage boundary, into these records; the rest
+# of the app reads typed attributes. Results are kept as a compact "WLW..." string.
+def _as_int(v: Any, default: Optional[int] = 0) -> Optional[int]:
+    try:
+        return int(v)
+    except (TypeError, ValueError):
+        return default
+
+class GameRecord:
+    """Per-game context aligned with Player.results; stored as {"wk", "opp", "ohc"} with unknown keys omitted."""
+    __slots__ = ("week", "opp", "ohc")
+
+    def __init__(self, week: Optional[int] = None, opp: str = "", ohc: Optional[int] = None):
+        self.week, self.opp, self.ohc = week, opp, ohc
+
+    @classmethod
+    def from_dict(cls, raw: Any) -> Optional["GameRecord"]:
+        if not isinstance(raw, dict) or not raw:
+            return None
+        return cls(_as_int(raw.get("wk"), None), str(raw.get("opp") or ""), _as_int(raw.get("ohc"), None))
+
+    def to_dict(self) -> Dict[str, Any]:
+        out: Dict[str, Any] = {}
+        if self.week is not None: out["wk"] = self.week
+        if self.opp: out["opp"] = self.opp
+        if self.ohc is not None: out["ohc"] = self.ohc
+        return out
+
+class Player:
+    __slots__ = ("name", "start_hc", "team", "results", "games")
+
+    def __init__(self, name: str, start_hc: int = 0, team: str = "", results: str = "", games: Optional[List[Optional[GameRecord]]] = None):
+        self.name, self.start_hc, self.team, self.results = name, start_hc, team, results
+        self.games: List[Optional[GameRecord]] = games if games is not None else [None] * len(results)
+
+    @property
+    def key(self) -> str:
+        return self.name.lower()
+
+    def game(self, i: int) -> Optional[GameRecord]:
+        return self.games[i] if i < len(self.games) else None
+
+    @classmethod
+    def from_dict(cls, raw: Dict[str, Any]) -> "Player":
+        res = raw.get("results")
+        results = "".join(r for r in res if r in ("W", "L")) if isinstance(res, (list, str)) else ""
+        games = raw.get("games") if isinstance(raw.get("games"), list) else []
+        games = [GameRecord.from_dict(g) for g in games[:len(results)]]
+        games += [None] * (len(results) - len(games))  # W/L-only data predates per-game records
+        return cls(str(raw.get("name") or ""), _as_int(raw.get("start_hc")), str(raw.get("team") or ""), results, games)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"name": self.name, "start_hc": self.start_hc, "team": self.team, "results": list(self.results),
+                "games": [g.to_dict() if g else {} for g in self.games]}
+
+class Announcement:
+    __slots__ = ("msg", "ts", "expires", "expires_at")
+
+    def __init__(self, msg: str, ts: str, expires: str):
+        self.msg, self.ts, self.expires = msg, ts, expires
+        try:
+            exp = datetime.fromisoformat(expires)
+            self.expires_at: Optional[datetime] = exp if exp.tzinfo else exp.replace(tzinfo=timezone.utc)
+        except (TypeError, ValueError):
+            self.expires_at = None
+
+    @classmethod
+    def from_dict(cls, raw: Dict[str, Any]) -> "Announcement":
+        return cls(str(raw.get("msg") or ""), str(raw.get("ts") or ""), raw.get("expires") or "")
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"msg": self.msg, "ts": self.ts, "expires": self.expires}
+
+class Match:
+    __slots__ = ("home", "away", "hf", "af")
+
+    def __init__(self, home: str, away: str, hf: Optional[int] = None, af: Optional[int] = None):
+        self.home, self.away, self.hf, self.af = home, away, hf, af
+
+    @classmethod
+    def from_dict(cls, raw: Dict[str, Any]) -> "Match":
+        return cls(str(raw.get("home") or ""), str(raw.get("away") or ""), _as_int(raw.get("hf"), None), _as_int(raw.get("af"), None))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"home": self.home, "away": self.away, "hf": self.hf, "af": self.af}
+
+class League:
+    __slots__ = ("season", "archived", "fixtures", "players", "announcement", "announcements", "league_results",
+                 "league_rules", "division_rules", "journal_ids", "bad_fixtures")
+
+    def __init__(self):
+        self.season = DEFAULT_SEASON
+        self.archived: List[str] = []                         # earlier seasons, oldest first; loaded on demand
+        self.fixtures: Optional[List[Dict[str, Any]]] = None  # None = built-in FIXTURES
+        self.players: List[Player] = []
+        self.announcement = ""
+        self.announcements: List[Announcement] = []
+        self.league_results: Dict[int, List[Match]] = {}
+        self.league_rules: Any = None
+        self.division_rules: Dict[str, Any] = {}
+        self.journal_ids: List[str] = []
+        self.bad_fixtures: Optional[Tuple[str, list]] = None  # (error, stored list) when stored fixtures don't validate
+
+    def player(self, name: str) -> Optional[Player]:
+        key = name.lower()
+        return next((p for p in self.players if p.key == key), None)
+
+    @classmethod
+    def from_dict(cls, raw: Any) -> "League":
+        raw = raw if isinstance(raw, dict) else {}
+        lg = cls()
+        lg.season = str(raw.get("season") or DEFAULT_SEASON)
+        lg.archived = [str(x) for x in raw.get("archived") or []]
+        if isinstance(raw.get("fixtures"), list):
+            try:
+                lg.fixtures = parse_fixtures(raw["fixtures"])
+            except ValueError as e:
+                lg.fixtures, lg.bad_fixtures = [], (str(e), raw["fixtures"])  # kept as stored, never shown
+        lg.players = [Player.from_dict(p) for p in raw.get("players") or [] if isinstance(p, dict)]
+        lg.announcement = str(raw.get("announcement") or "")
+        lg.announcements = [Announcement.from_dict(a) for a in raw.get("announcements") or [] if isinstance(a, dict)]
+        lres = raw.get("league_results") if isinstance(raw.get("league_results"), dict) else {}
+        for week, matches in lres.items():
+            week = _as_int(week, None)  # JSON object keys come back as strings
+            if week is not None and isinstance(matches, list):
+                lg.league_results[week] = [Match.from_dict(m) for m in matches if isinstance(m, dict)]
+        lg.league_rules = raw.get("league_rules")
+        lg.division_rules = raw.get("division_rules") if isinstance(raw.get("division_rules"), dict) else {}
+        lg.journal_ids = [str(i) for i in raw.get("journal_ids") or []]
+        return lg
+
+    def to_dict(self) -> Dict[str, Any]:
+        out: Dict[str, Any] = {
+            "season": self.season,
+            "archived": self.archived,
+            "players": [p.to_dict() for p in self.players],
+            "announcement": self.announcement,
+            "announcements": [a.to_dict() for a in self.announcements],
+            "league_results": {str(w): [m.to_dict() for m in ms] for w, ms in self.league_results.items()},
+        }
+        if self.league_rules is not None: out["league_rules"] = self.league_rules
+        if self.division_rules: out["division_rules"] = self.division_rules
+        if self.fixtures is not None: out["fixtures"] = self.bad_fixtures[1] if (self.bad_fixtures and not self.fixtures) else self.fixtures
+        if self.journal_ids: out["journal_ids"] = self.journal_ids
+        return out
+
 # ---------------- Persistence ----------------
 def _gist_headers():
     token = st.secrets.get("GITHUB_TOKEN", None)
@@ -236,13 +396,14 @@ def _gist_headers():
         return None
     return {"Authorization": f"token {token}", "Accept": "application/vnd.github+json"}
 
-def _gist_url():
-    gist_id = st.secrets.get("GIST_ID", None)
+def _gist_url(archive: bool = False):
+    gist_id = st.secrets.get("ARCHIVE_GIST_ID" if archive else "GIST_ID", None)
     if not gist_id:
         return None
-    return f"https://api.github.com/gists/{gist_id}"
+    api = st.secrets.get("GIST_API_URL", "https://api.github.com").rstrip("/")  # override to point at loadtest.py's fake
+    return f"{api}/gists/{gist_id}"
 
-def _load_from_gist_uncached() -> Optional[Dict[str, Any]]:
+def _load_from_gist_uncached() -> Optional[League]:
     url = _gist_url(); headers = _gist_headers()
     if not url or not headers:
         return None
@@ -253,130 +414,661 @@ def _load_from_gist_uncached() -> Optional[Dict[str, Any]]:
         files = data.get("files", {})
         if "league.json" in files:
             content = files["league.json"].get("content", "{}")
-            payload = json.loads(content or "{}")
-            if not isinstance(payload, dict):
-                payload = {}
-            payload.setdefault("players", [])
-            payload.setdefault("announcement", "")
-            payload.setdefault("announcements", [])
-            payload.setdefault("league_results", {})
-            for p in payload["players"]:
-                p.setdefault("team", "")
-            return payload
-        return {"players": [], "announcement": "", "announcements": [], "league_results": {}}
+            return League.from_dict(json.loads(content or "{}"))
+        return League()
     except Exception:
         return None
 
-def _save_to_gist(payload: Dict[str, Any]) -> bool:
+def _save_to_gist(league: League) -> bool:
     url = _gist_url(); headers = _gist_headers()
     if not url or not headers:
         return False
     try:
-        body = {"files": {"league.json": {"content": json.dumps(payload, indent=2)}}}
+        body = {"files": {"league.json": {"content": json.dumps(league.to_dict(), indent=2)}}}
         r = requests.patch(url, headers=headers, json=body, timeout=25)
         r.raise_for_status()
         return True
     except Exception:
         return False
 
-def _load_local() -> Optional[Dict[str, Any]]:
+def _load_local() -> Optional[League]:
     path = LOCAL_DATA_PATH
     if os.path.exists(path):
         try:
             with open(path, "r", encoding="utf-8") as f:
-                payload = json.load(f)
-            if not isinstance(payload, dict): payload = {}
-            payload.setdefault("players", [])
-            payload.setdefault("announcement", "")
-            payload.setdefault("announcements", [])
-            payload.setdefault("league_results", {})
-            for p in payload["players"]:
-                p.setdefault("team", "")
-            return payload
+                return League.from_dict(json.load(f))
         except Exception:
             return None
     return None
 
-def _save_local(payload: Dict[str, Any]) -> bool:
+def _save_local(league: League) -> bool:
     try:
         os.makedirs(os.path.dirname(LOCAL_DATA_PATH), exist_ok=True)
         with open(LOCAL_DATA_PATH, "w", encoding="utf-8") as f:
-            json.dump(payload, f, indent=2)
+            json.dump(league.to_dict(), f, indent=2)
+        return True
+    except Exception:
+        return False
+
+# Each finished season is an immutable segment: gist file season-<label>.json in ARCHIVE_GIST_ID, mirrored
+# under LOCAL_SEASONS_DIR. Segments never go in the main gist, whose GET returns every file, so startup and
+# journal replays only ever download league.json, the active season. With GIST_ID set, starting a new season
+# needs ARCHIVE_GIST_ID; without any gist, the local copy is the archive.
+def _season_filename(label: str) -> str:
+    return "season-" + "".join(c if c.isalnum() else "-" for c in label) + ".json"
+
+def archive_available() -> bool:
+    return bool(_gist_url(archive=True) and _gist_headers()) or not (_gist_url() and _gist_headers())
+
+def _save_season_segment(league: League) -> bool:
+    """Write the segment locally and to the archive gist; True only if it is stored somewhere durable."""
+    name = _season_filename(league.season); content = json.dumps(league.to_dict(), indent=2)
+    try:
+        os.makedirs(LOCAL_SEASONS_DIR, exist_ok=True)
+        with open(os.path.join(LOCAL_SEASONS_DIR, name), "w", encoding="utf-8") as f:
+            f.write(content)
+        saved_local = True
+    except Exception:
+        saved_local = False
+    url = _gist_url(archive=True); headers = _gist_headers()
+    if not url or not headers:
+        return saved_local and archive_available()
+    try:
+        r = requests.patch(url, headers=headers, json={"files": {name: {"content": content}}}, timeout=25)
+        r.raise_for_status()
+        _archive_files.clear()
         return True
     except Exception:
         return False
 
+@st.cache_resource(show_spinner=False, max_entries=50)
+def _season_segment(label: str, url: Optional[str]) -> League:
+    """Archived season, loaded once per process. Raises on failure so misses aren't cached."""
+    name = _season_filename(label)
+    path = os.path.join(LOCAL_SEASONS_DIR, name)
+    if os.path.exists(path):
+        with open(path, "r", encoding="utf-8") as f:
+            return League.from_dict(json.load(f))
+    if not url or not _gist_headers():
+        raise LookupError(f"No archive found for season {label}")
+    files = _archive_files(url)
+    if name not in files:  # archived since the listing was fetched (e.g. by another server process)
+        _archive_files.clear(); files = _archive_files(url)
+    meta = files.get(name)
+    if not meta:
+        raise LookupError(f"No archive found for season {label}")
+    content = meta["content"]
+    if content is None:
+        raw = requests.get(meta["raw_url"], timeout=20); raw.raise_for_status(); content = raw.text
+    season = League.from_dict(json.loads(content))
+    meta["content"] = None  # parsed copy is cached now; fall back to raw_url if it is ever evicted
+    return season
+
+@st.cache_resource(show_spinner=False)
+def _archive_files(url: str) -> Dict[str, Dict[str, Any]]:
+    """The archive gist's files (name -> raw_url and inline content), fetched once per process.
+
+    GET /gists/:id returns every segment, so one listing serves all labels instead of one GET each.
+    """
+    r = requests.get(url, headers=_gist_headers(), timeout=20); r.raise_for_status()
+    return {n: {"raw_url": m.get("raw_url"), "content": None if m.get("truncated") else m.get("content")}
+            for n, m in r.json().get("files", {}).items()}
+
+def load_season(label: str) -> Optional[League]:
+    """Read-only archived season (shared between sessions), or None if it can't be loaded now."""
+    try:
+        return _season_segment(label, _gist_url(archive=True))
+    except Exception:
+        return None
+
+def start_new_season(data: League, label: str, fixtures: Optional[List[Dict[str, Any]]] = None) -> Optional[League]:
+    """Archive `data` as a segment and return the next season, or None if the archive couldn't be written.
+
+    Starting handicaps carry over from each player's final handicap; results, weeks and highlights reset.
+    """
+    if not _save_season_segment(data):
+        return None
+    nxt = League()
+    nxt.season = label
+    nxt.archived = data.archived + [data.season]
+    nxt.fixtures = fixtures if fixtures is not None else []
+    nxt.announcement = data.announcement
+    nxt.league_rules, nxt.division_rules = data.league_rules, data.division_rules
+    nxt.journal_ids = data.journal_ids
+    nxt.players = [Player(p.name, current_handicap(p.start_hc, p.results, rules_for(data, p.team)), p.team) for p in data.players]
+    return nxt
+
+def season_fixtures(data: League) -> List[Dict[str, Any]]:
+    return FIXTURES if data.fixtures is None else data.fixtures
+
+def parse_fixtures(raw: Any) -> List[Dict[str, Any]]:
+    """Validate an uploaded fixture list shaped like FIXTURES; raises ValueError."""
+    if not isinstance(raw, list):
+        raise ValueError("fixtures must be a list of weeks")
+    out = []
+    for f in raw:
+        if not isinstance(f, dict) or not isinstance(f.get("matches"), list):
+            raise ValueError("each week needs 'week', 'date' and 'matches'")
+        week = _as_int(f.get("week"), None)
+        if week is None:
+            raise ValueError("each week needs 'week', 'date' and 'matches'")
+        datetime.strptime(str(f.get("date")), "%d/%m/%Y")
+        if not all(isinstance(m, str) and " v " in m for m in f["matches"]):
+            raise ValueError("matches must look like 'Home v Away'")
+        out.append({"week": week, "date": str(f["date"]), "matches": list(f["matches"])})
+    return out
+
+def _next_season_label(label: str) -> str:
+    try:
+        a, b = label.split("/")
+        return f"{int(a) + 1}/{(int(b) + 1) % 100:02d}"
+    except ValueError:
+        return ""
+
 def init_session_data():
     if "data" in st.session_state:
         return
-    data = _load_from_gist_uncached() or _load_local() or {"players": [], "announcement": "", "announcements": [], "league_results": {}}
-    for p in data.get("players", []):
-        p.setdefault("team", "")
+    feed_version = change_feed().version  # read first: changes landing during the load are re-applied (idempotent)
+    wal = write_journal()
+    remote = None
+    if _gist_url() and _gist_headers() and wal.due():  # while backing off, don't make page loads wait on the gist
+        remote = _load_from_gist_uncached()
+        if remote is None: wal.failed("Gist unreachable on load")
+        else: wal.seen(remote)
+    data = remote or _load_local() or League()
+    for entry in wal.pending():  # offline edits not yet in the gist
+        for kind, ident, value in entry["changes"]:
+            _apply_change(data, (kind, ident), value)
     st.session_state["data"] = data
-    st.session_state["storage_mode"] = "gist" if (_gist_url() and _gist_headers()) else ("local" if _load_local() is not None else "memory")
+    # "gist" only when this session's base document came from the gist; only then may a save overwrite it whole.
+    st.session_state["storage_mode"] = "gist" if remote is not None else ("local" if os.path.exists(LOCAL_DATA_PATH) else "memory")
+    st.session_state["feed_version"] = feed_version
+    st.session_state["synced"] = _fingerprints(data)
 
-def get_data() -> Dict[str, Any]:
+def get_data() -> League:
     return st.session_state["data"]
 
 def save_and_sync(show_toast: bool = False) -> bool:
+    gist = bool(_gist_url() and _gist_headers()); wal = write_journal(); entry: Dict[str, Any] = {}
+    def durable(changes):
+        if gist: entry.update(wal.append(changes))
+        else: _save_local(get_data())
+    sync_changes(get_data(), publish=True, durable=durable)
     payload = get_data()
-    ok = _save_to_gist(payload)
-    if not ok:
-        _save_local(payload)
+    _save_local(payload)
+    if not gist:
+        if show_toast: st.toast("Saved (local only)")
+        return False
+    gist_backed = st.session_state.get("storage_mode") == "gist"
+    ok = wal.flush(payload if gist_backed else None, own_id=entry.get("id"))
+    if ok and not gist_backed:
+        _reload_session_data()  # the gist is reachable again: swap the fallback copy for the real document
     if show_toast:
-        st.toast("Saved" if ok else "Saved (local only)")
+        st.toast("Saved" if ok else f"Saved locally · {wal.count()} change(s) waiting to sync")
     return ok
 
+# ---------------- Write-ahead journal ----------------
+# With a Gist configured, every save first appends its changed entities to an fsynced local journal.
+# The journal is replayed to the gist in order (GET, apply, PATCH) once it is reachable again. Entry ids
+# recorded in the gist's "journal_ids" make a replay after a lost PATCH response a no-op. While the gist
+# is failing, attempts back off so saves and page loads don't wait on network timeouts.
+def _merge_ids(*lists: List[str]) -> List[str]:
+    """Union of journal id lists in order of first appearance, keeping the newest JOURNAL_KEEP_IDS."""
+    return list(dict.fromkeys(i for ids in lists for i in ids))[-JOURNAL_KEEP_IDS:]
+
+class WriteJournal:
+    def __init__(self, path: str):
+        self.path = path
+        self.file_lock = threading.Lock()   # guards the file and the in-memory copy; held briefly
+        self.flush_lock = threading.Lock()  # one replay at a time; never waited on
+        self.failures = 0; self.retry_at = 0.0; self.last_error = ""
+        self.gist_ids: List[str] = []      # journal_ids last seen in or written to the gist by this process
+        self._entries: List[Dict[str, Any]] = self._read()
+
+    def _read(self) -> List[Dict[str, Any]]:
+        entries = []
+        if os.path.exists(self.path):
+            with open(self.path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entries.append(json.loads(line))
+                    except ValueError:
+                        pass  # torn last line from a crash mid-append
+        return entries
+
+    def pending(self) -> List[Dict[str, Any]]:
+        with self.file_lock:
+            return list(self._entries)
+
+    def count(self) -> int:
+        return len(self._entries)
+
+    def append(self, changes: List[Tuple[Tuple[str, Any], Any]]) -> Dict[str, Any]:
+        entry = {"id": uuid.uuid4().hex, "ts": datetime.now(timezone.utc).isoformat(), "changes": [[k[0], k[1], v] for k, v in changes]}
+        with self.file_lock:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry) + "\n"); f.flush(); os.fsync(f.fileno())
+            self._entries.append(entry)
+        return entry
+
+    def _drop(self, ids: set):
+        with self.file_lock:
+            self._entries = [e for e in self._entries if e["id"] not in ids]
+            tmp = self.path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                f.writelines(json.dumps(e) + "\n" for e in self._entries); f.flush(); os.fsync(f.fileno())
+            os.replace(tmp, self.path)
+
+    def seen(self, remote: League):
+        """Remember the entry ids the gist holds, so a PATCH that skips the GET can keep them."""
+        self.gist_ids = _merge_ids(self.gist_ids, remote.journal_ids)
+
+    def due(self) -> bool:
+        return time.monotonic() >= self.retry_at
+
+    def failed(self, reason: str):
+        self.failures += 1; self.last_error = reason
+        self.retry_at = time.monotonic() + JOURNAL_RETRY_SECONDS[min(self.failures, len(JOURNAL_RETRY_SECONDS)) - 1]
+
+    def flush(self, data: Optional[League] = None, own_id: Optional[str] = None, force: bool = False) -> bool:
+        """Push pending entries to the gist. Returns True when nothing is left pending.
+
+        If the only pending entry is `own_id`, `data` already holds it and is written as-is; callers pass
+        `data` only when it was loaded from the gist, so a fallback copy never replaces the gist.
+        Otherwise the gist is fetched and every pending entry is applied to it in order.
+        """
+        entries = self.pending()
+        if not entries:
+            return True
+        if not (force or self.due()) or not self.flush_lock.acquire(blocking=False):
+            return False
+        try:
+            ids = [e["id"] for e in entries]
+            if data is not None and ids == [own_id]:
+                target = data
+            else:
+                target = _load_from_gist_uncached()
+                if target is None:
+                    self.failed("Gist unreachable"); return False
+                self.seen(target)
+                done = set(target.journal_ids)
+                for e in entries:
+                    if e["id"] in done: continue
+                    for kind, ident, value in e["changes"]:
+                        _apply_change(target, (kind, ident), value)
+            # `data` is this session's copy: merge in ids other sessions recorded rather than overwrite them.
+            target.journal_ids = _merge_ids(self.gist_ids, target.journal_ids, ids)
+            if not _save_to_gist(target):
+                self.failed("Gist save failed"); return False
+            self.gist_ids = list(target.journal_ids)
+            self._drop(set(ids))
+            self.failures = 0; self.retry_at = 0.0; self.last_error = ""
+            return not self._entries
+        finally:
+            self.flush_lock.release()
+
+@st.cache_resource
+def write_journal() -> WriteJournal:
+    return WriteJournal(JOURNAL_PATH)
+
+# ---------------- Live change feed ----------------
+# Sessions in this server process share one feed. Every save publishes the players, weeks and
+# announcements it changed under a new version; other sessions compare versions on each rerun
+# and apply only those entities, instead of re-downloading the whole gist.
+FEED_DOCUMENT_KEYS = ("season", "archived", "fixtures", "announcement", "announcements", "league_rules", "division_rules")
+
+class ChangeFeed:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.version = 0
+        self.entries = deque(maxlen=FEED_MAX_ENTRIES)  # (version, entity_key, value | None for deleted)
+
+    # Callers hold `lock` across entries_since() and publish() so nothing lands in between.
+    def entries_since(self, since: int) -> Optional[List[Tuple[int, Tuple[str, Any], Any]]]:
+        """Entries after `since`, or None if some were already trimmed."""
+        if since < self.version and (not self.entries or self.entries[0][0] > since + 1):
+            return None
+        return [e for e in self.entries if e[0] > since]
+
+    def publish(self, changes: List[Tuple[Tuple[str, Any], Any]]) -> int:
+        self.version += 1
+        for key, value in changes:
+            self.entries.append((self.version, key, value))
+        return self.version
+
+@st.cache_resource
+def change_feed() -> ChangeFeed:
+    return ChangeFeed()
+
+def _entities(data: League) -> Dict[Tuple[str, Any], Any]:
+    """Entity key -> plain (stored-form) value; the feed only ever carries plain values."""
+    out: Dict[Tuple[str, Any], Any] = {(k, ""): getattr(data, k) for k in FEED_DOCUMENT_KEYS}
+    out[("announcements", "")] = [a.to_dict() for a in data.announcements]
+    for p in data.players:
+        out[("player", p.key)] = p.to_dict()
+    for week, matches in data.league_results.items():
+        out[("week", week)] = [m.to_dict() for m in matches]
+    return out
+
+def _fingerprint(value: Any) -> bytes:
+    """Short digest of an entity's plain value; sessions keep one per entity to spot their own edits.
+
+    For players the last two bytes are the number of games, the base _merge_appended works from.
+    """
+    games = len(value["results"]) if isinstance(value, dict) and isinstance(value.get("results"), list) else 0
+    return hashlib.blake2b(json.dumps(value, sort_keys=True).encode("utf-8"), digest_size=8).digest() + min(games, 0xFFFF).to_bytes(2, "big")
+
+def _merge_appended(base: Optional[bytes], mine: Any, theirs: Any) -> Optional[Dict[str, Any]]:
+    """Both sessions recorded games for the same player: their games, then the ones this session added.
+
+    Returns None (this session's copy wins) unless both kept the `base` games and this session appended.
+    """
+    if not (base and isinstance(mine, dict) and isinstance(theirs, dict)):
+        return None
+    n = int.from_bytes(base[-2:], "big"); a, b = mine["results"], theirs["results"]
+    if len(a) <= n or len(b) < n or a[:n] != b[:n]:
+        return None
+    merged = dict(mine)
+    merged["results"] = b + a[n:]; merged["games"] = list(theirs.get("games") or [{}] * len(b)) + mine["games"][n:]
+    return merged
+
+def _fingerprints(data: League) -> Dict[Tuple[str, Any], bytes]:
+    return {k: _fingerprint(v) for k, v in _entities(data).items()}
+
+def _apply_change(data: League, key: Tuple[str, Any], value: Any):
+    kind, ident = key
+    if kind == "player":
+        idx = next((i for i, p in enumerate(data.players) if p.key == ident), None)
+        if value is None:
+            if idx is not None: data.players.pop(idx)
+        elif idx is None:
+            data.players.append(Player.from_dict(value))
+        else:
+            data.players[idx] = Player.from_dict(value)
+    elif kind == "week":
+        if value is None: data.league_results.pop(ident, None)
+        else: data.league_results[ident] = [Match.from_dict(m) for m in value]
+    elif kind == "announcements":
+        data.announcements = [Announcement.from_dict(a) for a in value or []]
+    elif kind in FEED_DOCUMENT_KEYS:
+        setattr(data, kind, copy.deepcopy(value) if value is not None else getattr(League(), kind))
+
+def _reload_session_data():
+    del st.session_state["data"]
+    init_session_data()
+    _reset_week_inputs()
+    st.session_state.pop("game_index", None)
+
+def sync_changes(data: League, publish: bool = False,
+                 durable: Optional[Callable[[List[Tuple[Tuple[str, Any], Any]]], None]] = None) -> Tuple[int, List[Tuple[Tuple[str, Any], Any]]]:
+    """Apply other sessions' changes to `data` and, if `publish`, share this session's own edits.
+
+    Local edits win over remote ones for the same entity, except that games both sides appended to a
+    player are merged. `durable(changes)` runs before the changes are published, so a session that
+    loads after seeing the new version can also find them. Returns the number of remote changes
+    applied (-1 after a full reload) and the (entity key, plain value) changes published.
+    """
+    feed = change_feed()
+    since = st.session_state.get("feed_version", 0)
+    if not publish and feed.version == since:
+        return 0, []
+    synced = st.session_state.setdefault("synced", {})
+    ents = _entities(data)
+    current = {k: _fingerprint(v) for k, v in ents.items()}
+    local = {k for k, fp in current.items() if synced.get(k) != fp} | {k for k in synced if k not in current}
+    applied = 0; outgoing: List[Tuple[Tuple[str, Any], Any]] = []
+    with feed.lock:
+        missed = feed.entries_since(since)
+        for _, key, value in missed or []:
+            if key in local:
+                merged = _merge_appended(synced.get(key), ents.get(key), value) if key[0] == "player" else None
+                if merged is None:
+                    continue
+                _apply_change(data, key, merged); ents[key] = merged
+            else:
+                _apply_change(data, key, value)
+                if key[0] == "week": _reset_week_inputs(key[1])
+            applied += 1
+            if value is None: synced.pop(key, None)
+            else: synced[key] = _fingerprint(value)
+        if missed is not None:
+            outgoing = [(k, ents.get(k)) for k in local] if publish else []
+            if outgoing and durable:
+                durable(outgoing)
+            st.session_state["feed_version"] = feed.publish(outgoing) if outgoing else feed.version
+    if missed is None:
+        # Fell too far behind the feed: reload in full, re-apply this session's edits and sync again.
+        own = [(k, ents.get(k)) for k in local]
+        _reload_session_data()
+        fresh = get_data()
+        for k, v in own:
+            _apply_change(fresh, k, v)
+        _, outgoing = sync_changes(fresh, publish, durable)
+        return -1, outgoing
+    for k, v in outgoing:
+        if v is None: synced.pop(k, None)
+        else: synced[k] = _fingerprint(v)
+    if applied:
+        st.session_state.pop("game_index", None)
+    return applied, outgoing
+
 # ---------------- Handicap engine ----------------
-def evaluate_adjustments(results: List[str]):
-    adj_events = []
-    lock_until = -1
-    last_window = None
-    for i in range(len(results)):
-        if i < 3: continue
-        if i < lock_until: continue
-        window = results[i-3:i+1]
-        wins = window.count("W"); losses = window.count("L")
-        change = -7 if wins >= 3 else (+7 if losses >= 3 else 0)
-        if change:
-            adj_events.append({"game_index": i, "change": change})
-            lock_until = i + 4
-            last_window = (i-3, i)
-    delta = sum(e["change"] for e in adj_events)
-    return {"adjustments": adj_events, "delta": delta, "last_window": last_window}
-
-def current_handicap(start_hc: int, results: List[str]) -> int:
-    return start_hc + evaluate_adjustments(results)["delta"]
+# Rule sets compile to transition tables in handicap.py; league data picks them per league / team.
+def rules_for(data: League, team: str = "") -> HandicapRules:
+    spec = data.division_rules.get(team) or data.league_rules or "default"
+    try:
+        return resolve_rules(spec)
+    except (ValueError, TypeError, KeyError):
+        return resolve_rules("default")
 
 # ---------------- Player ops ----------------
-def upsert_player(data, name: str, start_hc: int, team: str = ""):
+def upsert_player(data: League, name: str, start_hc: int, team: str = ""):
     team = team if team in TEAM_CHOICES or team == "" else ""
-    for p in data.get("players", []):
-        if p.get("name","").lower() == name.lower():
-            p["start_hc"] = int(start_hc)
-            p["team"] = team
-            return
-    data["players"].append({"name": name, "start_hc": int(start_hc), "team": team, "results": []})
+    p = data.player(name)
+    if p:
+        p.start_hc = int(start_hc)
+        p.team = team
+        return
+    data.players.append(Player(name, int(start_hc), team))
+
+def delete_player(data: League, name: str):
+    data.players = [p for p in data.players if p.key != name.lower()]
+    idx = _cached_game_index(data)
+    if idx: idx.drop_player(name)
+
+# ---------------- Game records & indexes ----------------
+# Player.results is the W/L string the handicap engine reads; Player.games is aligned with it and holds a
+# GameRecord (fixture week, opponent, opponent's handicap when recorded) or None for W/L-only history.
+# Lookups by player, player pair and week go through a GameIndex cached per session.
+def _pair_key(a: str, b: str) -> Tuple[str, str]:
+    a, b = a.lower(), b.lower()
+    return (a, b) if a <= b else (b, a)
+
+class GameIndex:
+    """player -> games, player pair -> head-to-head games, week -> games. Entries are (player key, game #).
+
+    by_opponent maps a player key to the keys of everyone they have a head-to-head game with.
+    """
+    __slots__ = ("data", "players", "by_player", "by_pair", "by_week", "by_opponent")
+
+    def __init__(self, data: League):
+        self.data = data
+        self.players: Dict[str, Player] = {}
+        self.by_player: Dict[str, List[Tuple[str, int]]] = {}
+        self.by_pair: Dict[Tuple[str, str], List[Tuple[str, int]]] = {}
+        self.by_week: Dict[int, List[Tuple[str, int]]] = {}
+        self.by_opponent: Dict[str, set] = {}
+        for p in data.players:
+            self.players[p.key] = p
+            for i in range(len(p.results)):
+                self.add_game(p, i)
+
+    def _buckets(self, key: str, rec: Optional[GameRecord]):
+        yield self.by_player.setdefault(key, [])
+        if rec and rec.opp: yield self.by_pair.setdefault(_pair_key(key, rec.opp), [])
+        if rec and rec.week is not None: yield self.by_week.setdefault(rec.week, [])
+
+    def add_game(self, p: Player, i: int):
+        self.players[p.key] = p
+        rec = p.game(i)
+        for bucket in self._buckets(p.key, rec):
+            bucket.append((p.key, i))
+        if rec and rec.opp:
+            okey = rec.opp.lower()
+            self.by_opponent.setdefault(p.key, set()).add(okey); self.by_opponent.setdefault(okey, set()).add(p.key)
+
+    def pop_game(self, p: Player, i: int):
+        rec = p.game(i)
+        for bucket in self._buckets(p.key, rec):
+            if (p.key, i) in bucket: bucket.remove((p.key, i))
+        if rec and rec.opp and not self.by_pair.get(_pair_key(p.key, rec.opp)):
+            okey = rec.opp.lower()
+            self.by_opponent.get(p.key, set()).discard(okey); self.by_opponent.get(okey, set()).discard(p.key)
+
+    def drop_player(self, name: str):
+        key = name.lower(); self.players.pop(key, None); self.by_player.pop(key, None)
+        for buckets in (self.by_pair, self.by_week):
+            for k in list(buckets):
+                buckets[k] = [ref for ref in buckets[k] if ref[0] != key]
+        for okey in self.by_opponent.pop(key, set()):
+            if not self.by_pair.get(_pair_key(key, okey)): self.by_opponent.get(okey, set()).discard(key)
+
+    def game(self, ref: Tuple[str, int]) -> Tuple[Player, str, Optional[GameRecord]]:
+        p = self.players[ref[0]]
+        return p, p.results[ref[1]], p.game(ref[1])
+
+def _cached_game_index(data: League) -> Optional[GameIndex]:
+    idx = st.session_state.get("game_index")
+    return idx if (idx is not None and idx.data is data) else None
+
+def game_index(data: League) -> GameIndex:
+    idx = _cached_game_index(data)
+    if idx is None:
+        idx = st.session_state["game_index"] = GameIndex(data)
+    return idx
+
+def record_game(data: League, p: Player, result: str, week: Optional[int] = None, opponent: str = ""):
+    opp = data.player(opponent) if opponent else None
+    rec = None
+    if week is not None or opp is not None:
+        rec = GameRecord(week, opp.name if opp else "", current_handicap(opp.start_hc, opp.results, rules_for(data, opp.team)) if opp else None)
+    p.results += result; p.games.append(rec)
+    idx = _cached_game_index(data)
+    if idx: idx.add_game(p, len(p.results) - 1)
+
+def undo_last_game(data: League, p: Player) -> bool:
+    if not p.results:
+        return False
+    idx = _cached_game_index(data)
+    if idx: idx.pop_game(p, len(p.results) - 1)
+    p.results = p.results[:-1]; p.games.pop()
+    return True
+
+def head_to_head(data: League, a: str, b: str) -> List[Dict[str, Any]]:
+    """Games between `a` and `b` from a's side.
+
+    A game recorded by both players counts once (a's record wins). b's record matches one of a's with the
+    same week, or, when either week is unknown, one with the same result; the known week is kept.
+    """
+    idx = game_index(data); ak = a.lower()
+    own, mirrored = [], []
+    for ref in idx.by_pair.get(_pair_key(a, b), []):
+        _, r, rec = idx.game(ref)
+        if ref[0] == ak: own.append({"Week": rec.week, "Result": r})
+        else: mirrored.append({"Week": rec.week, "Result": "L" if r == "W" else "W"})
+    unmatched = list(own); extra = []
+    for g in sorted(mirrored, key=lambda g: g["Week"] is None):  # exact week matches first
+        same = next((o for o in unmatched if g["Week"] is not None and o["Week"] == g["Week"]), None)
+        same = same or next((o for o in unmatched if (o["Week"] is None or g["Week"] is None) and o["Result"] == g["Result"]), None)
+        if same is None:
+            extra.append(g)
+        else:
+            unmatched.remove(same)
+            if same["Week"] is None: same["Week"] = g["Week"]
+    return sorted(own + extra, key=lambda g: (g["Week"] is None, g["Week"] or 0))
+
+def head_to_head_summary(data: League, name: str) -> pd.DataFrame:
+    idx = game_index(data); rows = []
+    for okey in idx.by_opponent.get(name.lower(), ()):
+        other = idx.players.get(okey)
+        if other is None: continue
+        games = head_to_head(data, name, other.name)
+        wins = sum(1 for g in games if g["Result"] == "W")
+        rows.append({"Opponent": other.name, "Team": other.team, "Played": len(games), "W": wins, "L": len(games) - wins})
+    cols = ["Opponent", "Team", "Played", "W", "L"]
+    return pd.DataFrame(rows, columns=cols).sort_values("Opponent") if rows else pd.DataFrame(columns=cols)
+
+def form_by_opponent_strength(data: League, p: Player) -> Dict[str, Tuple[int, int]]:
+    """W-L split by whether the opponent's handicap was higher, equal or lower than the player's at the time."""
+    evald = evaluate_adjustments(p.results, rules_for(data, p.team))
+    adj = {e["game_index"]: e["change"] for e in evald["adjustments"]}
+    out = {"higher": [0, 0], "level": [0, 0], "lower": [0, 0]}
+    hc = p.start_hc
+    for i, (r, rec) in enumerate(zip(p.results, p.games)):
+        if rec and rec.ohc is not None:
+            band = "higher" if rec.ohc > hc else ("lower" if rec.ohc < hc else "level")
+            out[band][0 if r == "W" else 1] += 1
+        hc += adj.get(i, 0)
+    return {k: (w, l) for k, (w, l) in out.items()}
+
+def week_report(data: League, week: int) -> pd.DataFrame:
+    idx = game_index(data); rows = []
+    for ref in idx.by_week.get(week, []):
+        p, r, rec = idx.game(ref)
+        rows.append({"Player": p.name, "Team": p.team, "Result": r, "Opponent": rec.opp, "Opp HC": rec.ohc})
+    cols = ["Player", "Team", "Result", "Opponent", "Opp HC"]
+    return pd.DataFrame(rows, columns=cols).sort_values(["Team", "Player"]) if rows else pd.DataFrame(columns=cols)
+
+def career_df(data: League, name: str) -> pd.DataFrame:
+    """One row per season the player appears in. Archived seasons are loaded lazily and cached."""
+    rows = []; key = name.lower()
+    for label in data.archived + [data.season]:
+        season = data if label == data.season else load_season(label)
+        if season is None:
+            rows.append({"Season": label, "Team": "(unavailable)"}); continue
+        p = next((q for q in season.players if q.key == key), None)
+        if p is None: continue
+        evald = evaluate_adjustments(p.results, rules_for(season, p.team))
+        rows.append({"Season": label, "Team": p.team, "Start HC": p.start_hc, "End HC": p.start_hc + evald["delta"],
+                     "Games": len(p.results), "W": p.results.count("W"), "L": p.results.count("L")})
+    cols = ["Season", "Team", "Start HC", "End HC", "Games", "W", "L"]
+    return pd.DataFrame(rows, columns=cols)
+
+def _fixture_opponent_team(fixtures: List[Dict[str, Any]], week: int, team: str) -> Optional[str]:
+    fx = _fixture_week(fixtures, week)
+    for m in (fx["matches"] if fx else []):
+        h, a = _parse_match(m)
+        if team == h: return a
+        if team == a: return h
+    return None
 
-def delete_player(data, name: str):
-    data["players"] = [p for p in data.get("players", []) if p.get("name","").lower() != name.lower()]
+def _current_week(fixtures: List[Dict[str, Any]]) -> Optional[int]:
+    if not fixtures:
+        return None
+    today = datetime.now(timezone.utc).date(); week = fixtures[0]["week"]
+    for f in fixtures:
+        if datetime.strptime(f["date"], "%d/%m/%Y").date() <= today:
+            week = f["week"]
+    return week
 
-def roster_df(data):
+def roster_df(data: League, players: Optional[List[Player]] = None):
     rows = []
-    for p in data.get("players", []):
-        res = p.get("results", [])
-        cur = current_handicap(int(p.get("start_hc", 0)), res if isinstance(res, list) else [])
+    for p in (data.players if players is None else players):
+        res = p.results
+        evald = evaluate_adjustments(res, rules_for(data, p.team))
+        cur = p.start_hc + evald["delta"]
         rows.append({
-            "Player": p.get("name",""),
-            "Team": p.get("team",""),
-            "Season Start HC": int(p.get("start_hc", 0)),
+            "Player": p.name,
+            "Team": p.team,
+            "Season Start HC": p.start_hc,
             "Current HC": cur,
-            "Games": len(res) if isinstance(res, list) else 0,
-            "Wins": res.count("W") if isinstance(res, list) else 0,
-            "Losses": res.count("L") if isinstance(res, list) else 0,
-            "Cuts": sum(1 for e in evaluate_adjustments(res)["adjustments"] if e["change"] == -7) if isinstance(res, list) else 0,
-            "Increases": sum(1 for e in evaluate_adjustments(res)["adjustments"] if e["change"] == +7) if isinstance(res, list) else 0,
-            "Net Change": cur - int(p.get("start_hc", 0)),
+            "Games": len(res),
+            "Wins": res.count("W"),
+            "Losses": res.count("L"),
+            "Cuts": sum(1 for e in evald["adjustments"] if e["change"] < 0),
+            "Increases": sum(1 for e in evald["adjustments"] if e["change"] > 0),
+            "Net Change": cur - p.start_hc,
         })
     cols = ["Player","Team","Season Start HC","Current HC","Games","Wins","Losses","Cuts","Increases","Net Change"]
     return pd.DataFrame(rows, columns=cols) if rows else pd.DataFrame(columns=cols)
@@ -391,41 +1083,34 @@ def chip_html(results, last_window):
     return " ".join(chips) if chips else "<em>No games yet</em>"
 
 # ---------------- Announcements ----------------
-def add_highlight_announcement(data, player_name: str, change: int):
+def add_highlight_announcement(data: League, player_name: str, change: int):
     ts = datetime.now(timezone.utc); expires = ts + timedelta(days=7)
-    msg = f"🏆 {player_name} handicap cut by 7 after strong form." if change < 0 else f"📈 {player_name} handicap increased by 7 after recent results."
-    data.setdefault("announcements", []).append({"msg": msg, "ts": ts.isoformat(), "expires": expires.isoformat()})
+    msg = f"🏆 {player_name} handicap cut by {abs(change)} after strong form." if change < 0 else f"📈 {player_name} handicap increased by {abs(change)} after recent results."
+    data.announcements.append(Announcement(msg, ts.isoformat(), expires.isoformat()))
 
-def active_highlights(data):
-    out = []; now = datetime.now(timezone.utc)
-    for a in data.get("announcements", []):
-        try:
-            exp = datetime.fromisoformat(a.get("expires"))
-        except Exception:
-            continue
-        if exp.tzinfo is None: exp = exp.replace(tzinfo=timezone.utc)
-        if exp > now: out.append(a)
-    out.sort(key=lambda x: x.get("ts",""), reverse=True)
+def active_highlights(data: League) -> List[Announcement]:
+    now = datetime.now(timezone.utc)
+    out = [a for a in data.announcements if a.expires_at and a.expires_at > now]
+    out.sort(key=lambda a: a.ts, reverse=True)
     return out
 
-def remove_highlight_by_ts(data, ts_str: str) -> bool:
-    arr = data.get("announcements", [])
-    before = len(arr)
-    data["announcements"] = [a for a in arr if a.get("ts") != ts_str]
-    return len(data["announcements"]) < before
+def remove_highlight_by_ts(data: League, ts_str: str) -> bool:
+    before = len(data.announcements)
+    data.announcements = [a for a in data.announcements if a.ts != ts_str]
+    return len(data.announcements) < before
 
 # ---------------- League helpers (games-as-points) ----------------
-def _all_teams_from_fixtures() -> List[str]:
+def _all_teams_from_fixtures(fixtures: List[Dict[str, Any]]) -> List[str]:
     teams = set()
-    for f in FIXTURES:
+    for f in fixtures:
         for m in f["matches"]:
             if " v " in m:
                 h, a = m.split(" v ", 1)
                 teams.add(h.strip()); teams.add(a.strip())
     return sorted(teams)
 
-def _fixture_week(week: int) -> Optional[Dict[str, Any]]:
-    for f in FIXTURES:
+def _fixture_week(fixtures: List[Dict[str, Any]], week: int) -> Optional[Dict[str, Any]]:
+    for f in fixtures:
         if f["week"] == week:
             return f
     return None
@@ -434,20 +1119,24 @@ def _parse_match(s: str) -> Tuple[str, str]:
     h, a = s.split(" v ", 1)
     return h.strip(), a.strip()
 
-def _init_league_results(data: Dict[str, Any]):
-    data.setdefault("league_results", {})  # {week: [{"home":..., "away":..., "hf": int|None, "af": int|None}]}
-    return data["league_results"]
+def _reset_week_inputs(week: Optional[int] = None):
+    """Drop the League tab's score inputs for `week` (all weeks if None) so they re-read the stored result."""
+    prefixes = ("lg_hf_", "lg_af_") if week is None else (f"lg_hf_{week}_", f"lg_af_{week}_")
+    for k in [k for k in st.session_state if str(k).startswith(prefixes)]:
+        del st.session_state[k]
 
-def _compute_league_table(data: Dict[str, Any]) -> pd.DataFrame:
-    teams = _all_teams_from_fixtures()
+def _init_league_results(data: League) -> Dict[int, List[Match]]:
+    return data.league_results
+
+def _compute_league_table(data: League) -> pd.DataFrame:
+    teams = _all_teams_from_fixtures(season_fixtures(data))
     rows = {t: {"Team": t, "Played": 0, "Points": 0, "Games For": 0, "Games Against": 0} for t in teams}
 
-    lres = data.get("league_results", {})
-    for week, matches in lres.items():
+    for week, matches in data.league_results.items():
         for m in matches:
-            if m.get("hf") is None or m.get("af") is None:
+            if m.hf is None or m.af is None or m.home not in rows or m.away not in rows:
                 continue
-            h, a, hf, af = m["home"], m["away"], int(m["hf"]), int(m["af"])
+            h, a, hf, af = m.home, m.away, m.hf, m.af
             rows[h]["Played"] += 1; rows[a]["Played"] += 1
             rows[h]["Games For"] += hf; rows[h]["Games Against"] += af
             rows[a]["Games For"] += af; rows[a]["Games Against"] += hf
@@ -495,8 +1184,34 @@ st.markdown(base_css, unsafe_allow_html=True)
 # Init data
 if "data" not in st.session_state:
     init_session_data()
+sync_changes(get_data())
 data = get_data()
 
+@st.fragment(run_every=FEED_POLL_SECONDS)
+def live_updates():
+    version = change_feed().version
+    if version != st.session_state.get("feed_version"):
+        st.rerun()
+    st.caption(f"Live updates on · v{version}")
+    wal = write_journal()
+    if st.session_state.get("storage_mode") != "gist" and _gist_url() and _gist_headers() and wal.due():
+        _reload_session_data()  # loaded without the gist (backing off or unreachable); try again
+        if st.session_state.get("storage_mode") == "gist": st.rerun()
+    if wal.count():
+        wal.flush()
+        if wal.count():
+            wait = max(0, int(wal.retry_at - time.monotonic()))
+            st.warning(f"{wal.count()} change(s) saved on this device, waiting to sync"
+                       + (f" ({wal.last_error}; retry in {wait}s)." if wal.last_error else "."))
+            if st.button("Retry sync now", key="btn_retry_sync"):
+                if wal.flush(force=True): st.rerun()
+
+with st.sidebar:
+    st.caption(f"Season {data.season}")
+    if data.bad_fixtures:
+        st.warning(f"Stored fixtures for {data.season} are invalid ({data.bad_fixtures[0]}) and were ignored. Fix them in league.json and import it again.")
+    live_updates()
+
 # Tabs
 tab_home, tab_roster, tab_record, tab_player, tab_summary, tab_fixtures, tab_league, tab_import, tab_help = st.tabs(
     ["🏠 Home", "👥 Roster", "🎯 Record", "🧑 Player", "📊 Summary", "📅 Fixtures", "🏆 League", "📥 Import/Export", "❓ Help"]
@@ -505,32 +1220,32 @@ tab_home, tab_roster, tab_record, tab_player, tab_summary, tab_fixtures, tab_lea
 # ---------------- Home ----------------
 with tab_home:
     st.markdown(f"## {LEAGUE_NAME}")
-    st.caption("Snooker handicap tracker with rolling 4-game adjustments.")
+    st.caption(f"Snooker handicap tracker with rolling {rules_for(data).window}-game adjustments.")
     st.markdown("### 📣 Announcement")
     if admin_unlocked():
-        new_msg = st.text_area("Edit announcement (visible to everyone):", value=data.get("announcement",""), height=100, key="ta_announce")
+        new_msg = st.text_area("Edit announcement (visible to everyone):", value=data.announcement, height=100, key="ta_announce")
         if st.button("Save Announcement", key="btn_save_announce"):
-            data["announcement"] = new_msg.strip()
+            data.announcement = new_msg.strip()
             save_and_sync(True); st.rerun()
     else:
-        msg = data.get("announcement","").strip()
+        msg = data.announcement.strip()
         st.info(msg) if msg else st.caption("No announcement yet.")
 
     st.markdown("### 🌟 Highlights (last 7 days)")
     hs = active_highlights(data)
     if hs:
         for i, h in enumerate(hs[:10]):
-            ts = h.get('ts',''); dt = ts.split('T')[0] if ts else ''
+            ts = h.ts; dt = ts.split('T')[0] if ts else ''
             cols = st.columns([8,2]) if admin_unlocked() else [st.container()]
             if admin_unlocked():
                 with cols[0]:
-                    st.markdown(f"- {h['msg']}  \n  _since {dt}_")
+                    st.markdown(f"- {h.msg}  \n  _since {dt}_")
                 with cols[1]:
                     if st.button("Remove", key=f"rm_highlight_{i}"):
                         if remove_highlight_by_ts(data, ts):
                             save_and_sync(True); st.rerun()
             else:
-                st.markdown(f"- {h['msg']}  \n  _since {dt}_")
+                st.markdown(f"- {h.msg}  \n  _since {dt}_")
     else:
         st.caption("No recent highlights.")
 
@@ -560,27 +1275,28 @@ with tab_roster:
                 st.session_state["team_add"] = "(none)"
                 st.rerun()
         with form_cols[2]:
-            del_names = [p.get("name","") for p in data.get("players", [])]
+            del_names = [p.name for p in data.players]
             del_sel = st.selectbox("Delete player", ["(choose)"]+del_names, key="del_select")
             confirm = st.checkbox("Confirm delete", key="chk_del_confirm")
             if st.button("Delete", disabled=(not admin_unlocked()) or (del_sel=="(choose)") or (not confirm), key="btn_delete"):
                 delete_player(data, del_sel); save_and_sync(True); st.warning(f"Deleted {del_sel}."); st.rerun()
 
-    players = [p for p in data.get("players", []) if (p.get("team","") in selected_teams)]
+    players = [p for p in data.players if (p.team in selected_teams)]
     if q:
         ql = q.lower().strip()
-        players = [p for p in players if (ql in p.get("name","").lower() or ql in p.get("team","").lower())]
+        players = [p for p in players if (ql in p.key or ql in p.team.lower())]
 
     if view == "Cards":
         for p in players:
-            res = p.get("results", [])
-            cur = current_handicap(int(p.get("start_hc",0)), res)
+            res = p.results
+            team = p.team
+            p_rules = rules_for(data, team)
+            cur = current_handicap(p.start_hc, res, p_rules)
             wins = res.count("W"); losses = res.count("L")
-            team = p.get("team","")
             st.markdown(f"""
 <div class="card">
-  <h4>{p.get('name','')} <span class="badge">{team or '(no team)'}</span></h4>
-  <div class="sub">Start HC: <b>{int(p.get('start_hc',0))}</b> • Current HC: <b>{cur}</b> • Games: <b>{len(res)}/{MAX_GAMES}</b></div>
+  <h4>{p.name} <span class="badge">{team or '(no team)'}</span></h4>
+  <div class="sub">Start HC: <b>{p.start_hc}</b> • Current HC: <b>{cur}</b> • Games: <b>{len(res)}/{p_rules.max_games}</b></div>
   <div style="margin:6px 0;">
     <span class="metric">W: {wins}</span> <span class="metric">L: {losses}</span>
   </div>
@@ -588,13 +1304,13 @@ with tab_roster:
 """, unsafe_allow_html=True)
             cols = st.columns([1,1,6])
             with cols[0]:
-                if st.button("View", key=f"view_{p.get('name','')}"):
-                    st.session_state["selected_player"] = p.get("name",""); st.toast("Open the Player tab to view details.")
+                if st.button("View", key=f"view_{p.name}"):
+                    st.session_state["selected_player"] = p.name; st.toast("Open the Player tab to view details.")
             with cols[1]:
-                if st.button("Record", key=f"record_{p.get('name','')}"):
-                    st.session_state["selected_player"] = p.get("name",""); st.toast("Open the Record tab to add W/L.")
+                if st.button("Record", key=f"record_{p.name}"):
+                    st.session_state["selected_player"] = p.name; st.toast("Open the Record tab to add W/L.")
     else:
-        df_r = roster_df({"players": players})
+        df_r = roster_df(data, players)
         st.dataframe(df_r, width="stretch")
 
 # ---------------- Record ----------------
@@ -602,7 +1318,7 @@ with tab_record:
     st.subheader("Record W/L")
     inline_unlock("record")
     team_sel = st.selectbox("Team", ["All"] + TEAM_CHOICES, index=0, key="record_team")
-    names = [p.get("name","") for p in data.get("players", []) if (team_sel == "All" or p.get("team","") == team_sel)]
+    names = [p.name for p in data.players if (team_sel == "All" or p.team == team_sel)]
     if not names:
         st.info("Add players in the Roster tab first, or adjust team filter.")
     else:
@@ -611,39 +1327,51 @@ with tab_record:
             default_idx = names.index(st.session_state["selected_player"])
         sel = st.selectbox("Player", names, index=default_idx, key="sel_record")
 
-        player = next(p for p in data["players"] if p.get("name","") == sel)
-        res = player.setdefault("results", [])
-        evald_before = evaluate_adjustments(res); last_window = evald_before["last_window"]
+        player = next(p for p in data.players if p.name == sel)
+        res = player.results
+        p_rules = rules_for(data, player.team)
+        evald_before = evaluate_adjustments(res, p_rules); last_window = evald_before["last_window"]
 
         cA, cB, cC, cD = st.columns(4)
-        cA.metric("Season Start HC", int(player.get("start_hc",0)))
-        cB.metric("Current HC", current_handicap(int(player.get("start_hc",0)), res))
-        cC.metric("Games", f"{len(res)}/{MAX_GAMES}")
+        cA.metric("Season Start HC", player.start_hc)
+        cB.metric("Current HC", player.start_hc + evald_before["delta"])
+        cC.metric("Games", f"{len(res)}/{p_rules.max_games}")
         wins = res.count("W"); losses = res.count("L")
         cD.metric("W-L", f"{wins}-{losses}")
 
         st.markdown("**Timeline**")
         st.markdown(chip_html(res, last_window), unsafe_allow_html=True)
 
+        g1, g2 = st.columns(2)
+        fixtures = season_fixtures(data)
+        week_labels = ["(none)"] + [f"Week {f['week']} — {f['date']}" for f in fixtures]
+        cur_week = _current_week(fixtures)
+        wk_choice = g1.selectbox("Week", week_labels, index=next((i for i, f in enumerate(fixtures, 1) if f["week"] == cur_week), 0), key="record_week")
+        rec_week = None if wk_choice == "(none)" else fixtures[week_labels.index(wk_choice) - 1]["week"]
+        opp_team = _fixture_opponent_team(fixtures, rec_week, player.team) if rec_week is not None else None
+        opp_names = [p.name for p in data.players if p.name != sel and (opp_team is None or p.team == opp_team)]
+        opp_choice = g2.selectbox(f"Opponent ({opp_team})" if opp_team else "Opponent", ["(unknown)"] + opp_names, key="record_opp")
+        rec_opp = "" if opp_choice == "(unknown)" else opp_choice
+
         b1, b2, b3 = st.columns(3)
         if b1.button("✅ Add Win (W)", disabled=not admin_unlocked(), key="btn_add_win"):
-            if len(res) < MAX_GAMES:
-                res.append("W"); save_and_sync(True); st.rerun()
+            if len(res) < p_rules.max_games:
+                record_game(data, player, "W", rec_week, rec_opp); save_and_sync(True); st.rerun()
             else:
-                st.warning("Max 28 games reached.")
+                st.warning(f"Max {p_rules.max_games} games reached.")
         if b2.button("❌ Add Loss (L)", disabled=not admin_unlocked(), key="btn_add_loss"):
-            if len(res) < MAX_GAMES:
-                res.append("L"); save_and_sync(True); st.rerun()
+            if len(res) < p_rules.max_games:
+                record_game(data, player, "L", rec_week, rec_opp); save_and_sync(True); st.rerun()
             else:
-                st.warning("Max 28 games reached.")
+                st.warning(f"Max {p_rules.max_games} games reached.")
         if b3.button("↩️ Undo last game", disabled=not admin_unlocked(), key="btn_undo"):
-            if res:
-                res.pop(); save_and_sync(True); st.info("Undid last game"); st.rerun()
+            if undo_last_game(data, player):
+                save_and_sync(True); st.info("Undid last game"); st.rerun()
 
 # ---------------- Player ----------------
 with tab_player:
     team_sel_p = st.selectbox("Team", ["All"] + TEAM_CHOICES, index=0, key="player_team")
-    names = [p.get("name","") for p in data.get("players", []) if (team_sel_p == "All" or p.get("team","") == team_sel_p)]
+    names = [p.name for p in data.players if (team_sel_p == "All" or p.team == team_sel_p)]
     if not names:
         st.info("Add players first or change team filter.")
     else:
@@ -651,15 +1379,16 @@ with tab_player:
         if "selected_player" in st.session_state and st.session_state["selected_player"] in names:
             default_idx = names.index(st.session_state["selected_player"])
         sel = st.selectbox("Select player", names, key="player_detail", index=default_idx)
-        player = next(p for p in data["players"] if p.get("name","") == sel)
+        player = next(p for p in data.players if p.name == sel)
 
-        st.header(f"{sel}  ·  {player.get('team','')}")
-        start_hc_val = int(player.get("start_hc", 0)); res = player.get("results", [])
-        evald = evaluate_adjustments(res)
+        st.header(f"{sel}  ·  {player.team}")
+        start_hc_val = player.start_hc; res = player.results
+        p_rules = rules_for(data, player.team)
+        evald = evaluate_adjustments(res, p_rules)
         m1,m2,m3,m4 = st.columns(4)
         m1.metric("Season Start HC", start_hc_val)
-        m2.metric("Current HC", current_handicap(start_hc_val, res))
-        m3.metric("Games", f"{len(res)}/{MAX_GAMES}")
+        m2.metric("Current HC", start_hc_val + evald["delta"])
+        m3.metric("Games", f"{len(res)}/{p_rules.max_games}")
         win_pct = (res.count("W")/len(res)*100) if res else 0.0
         m4.metric("Win %", f"{win_pct:.1f}%")
 
@@ -670,13 +1399,32 @@ with tab_player:
         cur_hc = start_hc_val
         for i, r in enumerate(res):
             change = adj_map.get(i, 0); cur_hc += change
-            rows.append({"Game #": i+1, "Result": r, "Adj": change, "HC After": cur_hc})
+            rec = player.game(i)
+            rows.append({"Game #": i+1, "Week": rec.week if rec else None, "Opponent": rec.opp if rec else "", "Result": r, "Adj": change, "HC After": cur_hc})
         dfp = pd.DataFrame(rows)
         if not dfp.empty:
+            dfp["Week"] = dfp["Week"].astype("Int64")
             st.dataframe(dfp, width="stretch")
         else:
             st.caption("No games yet.")
 
+        st.markdown("#### Form vs opponent handicap")
+        form = form_by_opponent_strength(data, player)
+        f1, f2, f3 = st.columns(3)
+        for col, band, label in ((f1, "higher", "vs higher HC"), (f2, "level", "vs same HC"), (f3, "lower", "vs lower HC")):
+            col.metric(label, f"{form[band][0]}-{form[band][1]}")
+
+        st.markdown("#### Head-to-head")
+        h2h = head_to_head_summary(data, sel)
+        if not h2h.empty:
+            st.dataframe(h2h, width="stretch", hide_index=True)
+        else:
+            st.caption("No games with a recorded opponent yet.")
+
+        if data.archived and st.toggle("Career stats (all seasons)", key="career_toggle"):
+            with st.spinner("Loading past seasons..."):
+                st.dataframe(career_df(data, sel), width="stretch", hide_index=True)
+
 # ---------------- Summary ----------------
 with tab_summary:
     st.subheader("Summary")
@@ -705,63 +1453,70 @@ with tab_summary:
 # ---------------- Fixtures ----------------
 with tab_fixtures:
     st.subheader("Fixtures")
-    labels = [f"Week {f['week']} — {f['date']}" for f in FIXTURES]
-    label_to_fixture = {f"Week {f['week']} — {f['date']}": f for f in FIXTURES}
-    choice = st.selectbox("Select week", labels, index=0)
-    fx = label_to_fixture[choice]
-    st.markdown(f"### {choice}")
-    show = pd.DataFrame({"Match #": [1,2,3,4], "Fixture": fx["matches"]})
-    st.dataframe(show, width="stretch")
+    fixtures = season_fixtures(data)
+    if not fixtures:
+        st.caption(f"No fixtures loaded for {data.season}.")
+    else:
+        labels = [f"Week {f['week']} — {f['date']}" for f in fixtures]
+        label_to_fixture = {f"Week {f['week']} — {f['date']}": f for f in fixtures}
+        choice = st.selectbox("Select week", labels, index=0)
+        fx = label_to_fixture[choice]
+        st.markdown(f"### {choice}")
+        show = pd.DataFrame({"Match #": list(range(1, len(fx["matches"]) + 1)), "Fixture": fx["matches"]})
+        st.dataframe(show, width="stretch")
+        st.markdown("#### Player results")
+        wr = week_report(data, fx["week"])
+        if not wr.empty:
+            st.dataframe(wr, width="stretch", hide_index=True)
+        else:
+            st.caption("No games recorded against this week yet.")
 
 # ---------------- League (games wording + confirmations) ----------------
 with tab_league:
     st.subheader("League results")
     league_results = _init_league_results(data)
 
-    labels = [f"Week {f['week']} — {f['date']}" for f in FIXTURES]
-    label_to_week = {lab: f["week"] for lab, f in zip(labels, FIXTURES)}
-    choice = st.selectbox("Select week to edit", labels, index=0, key="lg_week_combined")
-    week = label_to_week[choice]
-    fx = _fixture_week(week)
-
-    existing = league_results.get(week, [])
-    if not existing:
-        seeded = []
-        for s in fx["matches"]:
-            h, a = _parse_match(s)
-            seeded.append({"home": h, "away": a, "hf": None, "af": None})
-        league_results[week] = seeded
-
-    valid_all = True
-    for i, m in enumerate(league_results[week]):
-        st.markdown(f"**Match {i+1}: {m['home']} vs {m['away']}**")
-        c1, c2 = st.columns(2)
-        with c1:
-            hf = st.number_input(f"{m['home']} games won", min_value=0, max_value=4, value=(m["hf"] if m["hf"] is not None else 0), key=f"lg_hf_{week}_{i}", step=1)
-        with c2:
-            af = st.number_input(f"{m['away']} games won", min_value=0, max_value=4, value=(m["af"] if m["af"] is not None else 0), key=f"lg_af_{week}_{i}", step=1)
-        total = int(hf) + int(af)
-        if total != 4:
-            st.error("Total games must be 4 (valid results: 4–0, 3–1, 2–2, 1–3, 0–4).")
-            valid_all = False
-        else:
-            st.caption(f"Result: **{m['home']} {int(hf)}–{int(af)} {m['away']}**")
-        m["hf"], m["af"] = int(hf), int(af)
-        st.divider()
-
-    csave, cclear = st.columns([1,1])
-    confirm_save = csave.checkbox("Confirm save", key=f"lg_confirm_save_{week}")
-    if csave.button("💾 Save week results", disabled=(not admin_unlocked()) or (not valid_all) or (not confirm_save), key=f"lg_save_{week}"):
-        save_and_sync(True); st.success("Week saved."); st.rerun()
-
-    confirm_clear = cclear.checkbox("Confirm clear", key=f"lg_confirm_clear_{week}")
-    if cclear.button("🗑 Clear week results", disabled=(not admin_unlocked()) or (not confirm_clear), key=f"lg_clear_{week}"):
-        reset = []
-        for s in fx["matches"]:
-            h, a = _parse_match(s)
-            reset.append({"home": h, "away": a, "hf": None, "af": None})
-        league_results[week] = reset
-        save_and_sync(True); st.warning("Week cleared."); st.rerun()
+    fixtures = season_fixtures(data)
+    if not fixtures:
+        st.caption(f"No fixtures loaded for {data.season}.")
+    else:
+        labels = [f"Week {f['week']} — {f['date']}" for f in fixtures]
+        label_to_week = {lab: f["week"] for lab, f in zip(labels, fixtures)}
+        choice = st.selectbox("Select week to edit", labels, index=0, key="lg_week_combined")
+        week = label_to_week[choice]
+        fx = _fixture_week(fixtures, week)
+
+        # Score inputs live in widget state until saved; rendering never touches `data`, so an unsaved week
+        # isn't mistaken for a local edit (and published) by sync_changes.
+        shown = league_results.get(week) or [Match(*_parse_match(s)) for s in fx["matches"]]
+        valid_all = True; entered = []
+        for i, m in enumerate(shown):
+            st.markdown(f"**Match {i+1}: {m.home} vs {m.away}**")
+            c1, c2 = st.columns(2)
+            with c1:
+                hf = st.number_input(f"{m.home} games won", min_value=0, max_value=4, value=(m.hf if m.hf is not None else 0), key=f"lg_hf_{week}_{i}", step=1)
+            with c2:
+                af = st.number_input(f"{m.away} games won", min_value=0, max_value=4, value=(m.af if m.af is not None else 0), key=f"lg_af_{week}_{i}", step=1)
+            total = int(hf) + int(af)
+            if total != 4:
+                st.error("Total games must be 4 (valid results: 4–0, 3–1, 2–2, 1–3, 0–4).")
+                valid_all = False
+            else:
+                st.caption(f"Result: **{m.home} {int(hf)}–{int(af)} {m.away}**")
+            entered.append(Match(m.home, m.away, int(hf), int(af)))
+            st.divider()
+
+        csave, cclear = st.columns([1,1])
+        confirm_save = csave.checkbox("Confirm save", key=f"lg_confirm_save_{week}")
+        if csave.button("💾 Save week results", disabled=(not admin_unlocked()) or (not valid_all) or (not confirm_save), key=f"lg_save_{week}"):
+            league_results[week] = entered
+            save_and_sync(True); st.success("Week saved."); st.rerun()
+
+        confirm_clear = cclear.checkbox("Confirm clear", key=f"lg_confirm_clear_{week}")
+        if cclear.button("🗑 Clear week results", disabled=(not admin_unlocked()) or (not confirm_clear), key=f"lg_clear_{week}"):
+            league_results[week] = [Match(*_parse_match(s)) for s in fx["matches"]]
+            _reset_week_inputs(week)
+            save_and_sync(True); st.warning("Week cleared."); st.rerun()
 
     st.markdown("### League Table")
     df_table = _compute_league_table(data)
@@ -770,7 +1525,7 @@ with tab_league:
 # ---------------- Import/Export ----------------
 with tab_import:
     st.subheader("Import / Export")
-    st.download_button("⬇️ Download JSON backup", data=json.dumps(get_data(), indent=2), file_name="league_backup.json", mime="application/json", key="dl_json")
+    st.download_button("⬇️ Download JSON backup", data=json.dumps(get_data().to_dict(), indent=2), file_name="league_backup.json", mime="application/json", key="dl_json")
     df = roster_df(data)
     st.download_button("⬇️ Download Summary CSV", data=df.to_csv(index=False).encode("utf-8"), file_name="summary.csv", mime="text/csv", key="dl_csv")
 
@@ -781,41 +1536,69 @@ with tab_import:
         try:
             payload = json.load(up)
             if isinstance(payload, dict):
-                payload.setdefault("players", [])
-                payload.setdefault("announcement", "")
-                payload.setdefault("announcements", [])
-                payload.setdefault("league_results", {})
-                for p in payload["players"]:
-                    p.setdefault("team","")
+                imported = League.from_dict(payload)
                 st.success("File parsed. Click 'Apply Import' to overwrite current data.")
                 if st.button("Apply Import", key="btn_apply_import"):
-                    st.session_state["data"] = payload
+                    st.session_state["data"] = imported
                     save_and_sync(True); st.success("Import applied."); st.rerun()
             else:
                 st.error("Invalid file: top-level JSON must be an object.")
         except Exception as e:
             st.error(f"Failed to parse JSON: {e}")
 
+    st.markdown("#### Seasons")
+    st.caption(f"Current season: **{data.season}**" + (f" · archived: {', '.join(data.archived)}" if data.archived else ""))
+    if admin_unlocked():
+        with st.expander("Start a new season", expanded=False):
+            st.caption("Archives this season and starts the next one with the same roster. Each player's starting handicap is their current handicap; results, league weeks and highlights reset.")
+            new_label = st.text_input("New season", value=_next_season_label(data.season), key="season_new_label").strip()
+            fx_up = st.file_uploader("Fixtures JSON for the new season (optional, same shape as the built-in list)", type=["json"], key="season_fixtures")
+            confirm_season = st.checkbox("Confirm start new season", key="chk_new_season")
+            taken = _season_filename(new_label) in {_season_filename(s) for s in data.archived + [data.season]}
+            if taken:
+                st.error(f"Season {new_label} already exists (or is stored under the same name).")
+            if not archive_available():
+                st.warning("Set ARCHIVE_GIST_ID in Secrets to a second gist for past seasons before starting a new one.")
+            if st.button("Start season", disabled=(not new_label) or taken or (not confirm_season) or (not archive_available()), key="btn_new_season"):
+                try:
+                    new_fixtures = parse_fixtures(json.load(fx_up)) if fx_up else None
+                except Exception as e:
+                    st.error(f"Invalid fixtures file: {e}")
+                else:
+                    nxt = start_new_season(data, new_label, new_fixtures)
+                    if nxt is None:
+                        st.error("Couldn't archive the current season; check the connection and try again.")
+                    else:
+                        st.session_state["data"] = nxt
+                        for k in ("season_new_label", "chk_new_season"): st.session_state.pop(k, None)
+                        save_and_sync(True); st.success(f"Season {new_label} started."); st.rerun()
+
 # ---------------- Help ----------------
 with tab_help:
     st.subheader("About & Help")
-    st.markdown("""
+    league_rules = rules_for(data)
+    st.markdown(f"""
 **What is this?**  
-Snooker handicap tracker for the **Belfast District Snooker League**. Handicaps adjust in a **rolling 4-game window**:  
-- **Cut -7** if a player wins **3 or 4** of the last 4.  
-- **Increase +7** if a player loses **3 or 4** of the last 4.  
-- **No change** at 2–2.  
-Once adjusted, the next possible change is after a **minimum of 4 more games**. Max games per player: **28**.
+Snooker handicap tracker for the **{LEAGUE_NAME}**. {league_rules.help_markdown()}
 
 **Tabs**  
 - **Roster**: manage players (name, start handicap, team). Search and filter by team.  
-- **Record**: add W/L per player; timeline highlights the last 4-game window that triggered a change.  
-- **Player**: detailed stats per player.  
+- **Record**: add W/L per player, with the fixture week and opponent; timeline highlights the last {league_rules.window}-game window that triggered a change.  
+- **Player**: detailed stats per player, head-to-head records and form against higher/lower handicaps.  
 - **Summary**: overview table + quick stats.  
-- **Fixtures**: published league fixtures by week.  
+- **Fixtures**: published league fixtures by week, with the player results recorded for it.  
 - **League**: enter weekly **team results** where **games won = points** (e.g., 3–1 ⇒ 3 pts / 1 pt). Auto league table.  
 - **Import/Export**: backup and restore data.  
 
+**Seasons**  
+Each season keeps its own roster, fixtures and results. Starting a new season (Import/Export tab) archives the current one and carries every player's final handicap over as their new starting handicap. Past seasons are only loaded when you open **Career stats** on the Player tab. With a Gist, past seasons are kept in a separate archive gist (ARCHIVE_GIST_ID in Secrets) so the main one stays small.
+
+**Offline saving**  
+If the Gist can't be reached, saves are kept on this device and sent automatically, in order, once it is reachable again. The sidebar shows how many changes are waiting.
+
+**Live updates**  
+Results, players and announcements saved in another browser appear automatically within about 10 seconds; no refresh needed.
+
 **Admin PIN**  
 Add `ADMIN_PIN` in Streamlit secrets to restrict editing. Unlock via the sidebar to enable save/clear/delete actions.
 """)
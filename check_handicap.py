@@ -0,0 +1,98 @@
+"""Equivalence check for the compiled handicap engine in handicap.py.
+
+The engine replaced a plain rolling-window loop with a transition table. This
+script compares the two: the default rules against the original loop (kept verbatim below)
+on every sequence up to 12 games and on random full seasons, and a spread of other rule
+sets against the same loop generalised to its parameters. It also checks that parameters
+outside the supported bounds are rejected.
+
+    python check_handicap.py --sequences 20000
+"""
+import argparse
+import itertools
+import random
+import sys
+from typing import List, Optional
+
+import handicap
+
+# ---------------- Reference implementations ----------------
+def original_loop(results: List[str]):
+    """evaluate_adjustments as it was before the engine (fixed 4-game window, ±7, 4-game lock)."""
+    adj_events = []
+    lock_until = -1
+    last_window = None
+    for i in range(len(results)):
+        if i < 3: continue
+        if i < lock_until: continue
+        window = results[i-3:i+1]
+        wins = window.count("W"); losses = window.count("L")
+        change = -7 if wins >= 3 else (+7 if losses >= 3 else 0)
+        if change:
+            adj_events.append({"game_index": i, "change": change})
+            lock_until = i + 4
+            last_window = (i-3, i)
+    delta = sum(e["change"] for e in adj_events)
+    return {"adjustments": adj_events, "delta": delta, "last_window": last_window}
+
+def generalised_loop(results: List[str], window: int, trigger: int, step: int, lock: int, max_games: int):
+    adj_events = []; lock_until = -1; last_window = None
+    for i in range(window - 1, len(results)):
+        if i < lock_until: continue
+        chunk = results[i-window+1:i+1]
+        wins = chunk.count("W"); losses = window - wins
+        change = -step if wins >= trigger else (step if losses >= trigger else 0)
+        if change:
+            adj_events.append({"game_index": i, "change": change})
+            lock_until = i + lock
+            last_window = (i-window+1, i)
+    return {"adjustments": adj_events, "delta": sum(e["change"] for e in adj_events), "last_window": last_window}
+
+# ---------------- Checks ----------------
+def _random_seq(rng: random.Random, max_len: int) -> List[str]:
+    p = rng.random()  # vary form so long streaks (and locks) are common
+    return ["W" if rng.random() < p else "L" for _ in range(rng.randint(0, max_len))]
+
+def check(sequences: int, seed: int) -> List[str]:
+    rules_cls, resolve = handicap.HandicapRules, handicap.resolve_rules
+    rng = random.Random(seed); failures: List[str] = []
+
+    default = resolve("default")
+    cases = [list(s) for n in range(13) for s in itertools.product("WL", repeat=n)]
+    cases += [_random_seq(rng, default.max_games) for _ in range(sequences)]
+    for seq in cases:
+        if default.evaluate(seq) != original_loop(seq):
+            failures.append(f"default rules differ from the original loop on {''.join(seq)}")
+
+    grid = [(w, t, s, l, g) for w in (2, 3, 4, 5, 7, handicap.RULE_MAX_WINDOW) for t in range(1, w + 1)
+            for s in (0, 5) for l in (1, 3, w + 2) for g in (handicap.MAX_GAMES,)]
+    per_rule = max(50, sequences // len(grid))
+    for params in grid:
+        rules = rules_cls(*params)
+        for _ in range(per_rule):
+            seq = _random_seq(rng, 40)
+            if rules.evaluate(seq) != generalised_loop(seq, *params):
+                failures.append(f"rules {params} differ from the generalised loop on {''.join(seq)}"); break
+
+    for bad in [(1, 1, 7, 1, 28), (handicap.RULE_MAX_WINDOW + 1, 3, 7, 4, 28), (4, 5, 7, 4, 28), (4, 3, -1, 4, 28),
+                (4, 3, 7, 0, 28), (4, 3, 7, 29, 28), (4, 3, 7, 4, handicap.RULE_MAX_GAMES + 1)]:
+        try:
+            rules_cls(*bad)
+            failures.append(f"rules {bad} should have been rejected")
+        except ValueError:
+            pass
+    return failures
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    ap.add_argument("--sequences", type=int, default=20000, help="random seasons checked against the original loop")
+    ap.add_argument("--seed", type=int, default=1)
+    a = ap.parse_args(argv)
+    failures = check(a.sequences, a.seed)
+    for f in failures[:20]:
+        print(f)
+    print(f"{len(failures)} mismatch(es)" if failures else "handicap engine matches the reference loops")
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,88 @@
+"""Handicap engine shared by app.py and check_handicap.py.
+
+A rule set is a handful of integers. Each distinct set compiles once into a transition table over
+(games seen, last window-1 results as bits, games still locked), so evaluating a player is a single
+table lookup per game whatever the window size. League data may pick a preset or override
+parameters with "league_rules", and per team (division) with "division_rules".
+"""
+import functools
+from typing import Dict, Any, List, Optional, Sequence, Tuple
+
+MAX_GAMES = 28
+RULE_KEYS = ("window", "trigger", "step", "lock", "max_games")
+RULE_MAX_WINDOW = 10        # table size grows ~2^(window-1) * lock; these bounds keep a compile under ~0.2s
+RULE_MAX_GAMES = 60
+HANDICAP_RULESETS: Dict[str, Dict[str, int]] = {
+    "default": {"window": 4, "trigger": 3, "step": 7, "lock": 4, "max_games": MAX_GAMES},
+}
+
+class HandicapRules:
+    __slots__ = RULE_KEYS + ("table",)
+
+    def __init__(self, window: int, trigger: int, step: int, lock: int, max_games: int):
+        if not (2 <= window <= RULE_MAX_WINDOW and 1 <= trigger <= window and 1 <= lock <= max_games <= RULE_MAX_GAMES and step >= 0):
+            raise ValueError(f"Invalid handicap rules: window={window} trigger={trigger} step={step} lock={lock} max_games={max_games}")
+        self.window, self.trigger, self.step, self.lock, self.max_games = window, trigger, step, lock, max_games
+        self.table = self._compile()
+
+    def _compile(self) -> List[Tuple[int, int, int, int]]:
+        """Rows are (next state on W, change on W, next state on L, change on L); state 0 is a new season."""
+        hist = self.window - 1; mask = (1 << hist) - 1
+        index: Dict[Tuple[int, int, int], int] = {}; table: List[Any] = []; pending = []
+        def state_id(state):
+            if state not in index:
+                index[state] = len(table); table.append(None); pending.append(state)
+            return index[state]
+        state_id((0, 0, 0))
+        while pending:
+            filled, bits, locked = state = pending.pop()
+            row = []
+            for won in (1, 0):
+                change = 0
+                if filled == hist and locked == 0:
+                    wins = bin(bits).count("1") + won; losses = self.window - wins
+                    change = -self.step if wins >= self.trigger else (self.step if losses >= self.trigger else 0)
+                nxt = (min(filled + 1, hist), ((bits << 1) | won) & mask, self.lock - 1 if change else max(locked - 1, 0))
+                row += [state_id(nxt), change]
+            table[index[state]] = tuple(row)
+        return table
+
+    def evaluate(self, results: Sequence[str]) -> Dict[str, Any]:
+        table = self.table; state = 0; adj_events = []; delta = 0
+        for i, r in enumerate(results):
+            row = table[state]
+            if r == "W": state, change = row[0], row[1]
+            else: state, change = row[2], row[3]
+            if change:
+                adj_events.append({"game_index": i, "change": change}); delta += change
+        last_window = (adj_events[-1]["game_index"] - self.window + 1, adj_events[-1]["game_index"]) if adj_events else None
+        return {"adjustments": adj_events, "delta": delta, "last_window": last_window}
+
+    def help_markdown(self) -> str:
+        w, t = self.window, self.trigger
+        counts = f"{t} or {w}" if w - t == 1 else (f"all {w}" if t == w else f"{t} or more")
+        neutral = f"at {w // 2}–{w // 2}" if (w % 2 == 0 and t == w // 2 + 1) else "otherwise"
+        return (f"Handicaps adjust in a **rolling {w}-game window**:  \n"
+                f"- **Cut -{self.step}** if a player wins **{counts}** of the last {w}.  \n"
+                f"- **Increase +{self.step}** if a player loses **{counts}** of the last {w}.  \n"
+                f"- **No change** {neutral}.  \n"
+                f"Once adjusted, the next possible change is after a **minimum of {self.lock} more games**. Max games per player: **{self.max_games}**.")
+
+@functools.lru_cache(maxsize=None)
+def _compiled_rules(params: Tuple[int, ...]) -> HandicapRules:
+    return HandicapRules(*params)
+
+def resolve_rules(spec: Any = "default") -> HandicapRules:
+    """`spec` is a preset name or a dict of parameters, optionally based on {"ruleset": name}."""
+    if isinstance(spec, dict):
+        params = dict(HANDICAP_RULESETS.get(spec.get("ruleset", "default"), HANDICAP_RULESETS["default"]))
+        params.update({k: int(spec[k]) for k in RULE_KEYS if k in spec})
+    else:
+        params = HANDICAP_RULESETS.get(spec, HANDICAP_RULESETS["default"])
+    return _compiled_rules(tuple(int(params[k]) for k in RULE_KEYS))
+
+def evaluate_adjustments(results: Sequence[str], rules: Optional[HandicapRules] = None):
+    return (rules or resolve_rules()).evaluate(results)
+
+def current_handicap(start_hc: int, results: Sequence[str], rules: Optional[HandicapRules] = None) -> int:
+    return start_hc + evaluate_adjustments(results, rules)["delta"]
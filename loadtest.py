@@ -0,0 +1,318 @@
+"""Concurrent-session load test for app.py against a local fake of the Gist API.
+
+Runs N simulated browser sessions (Streamlit AppTests) that mix reads with W/L
+entries, all pointed at an in-process HTTP stand-in for api.github.com/gists.
+Like a real Streamlit server, every session lives in this one process and runs
+its reruns on its own thread, so st.cache_resource state (the change feed, the
+write journal) is shared and reruns overlap. Reports rerun latency, memory per
+session (data, sync fingerprints and game index), Gist traffic and lost updates:
+writes the app reported as saved, and seeded players, missing afterwards.
+
+    python loadtest.py --sessions 8 --ops 20 --write-ratio 0.3 --latency 0.15 --error-rate 0.02
+    python loadtest.py --sessions 4 --players 8 --ops 12 --think 2 --fail-first 1   # outage at startup
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Any, List, Optional
+
+APP_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "app.py")
+GIST_ID = "loadtest"
+
+# ---------------- Fake Gist API ----------------
+class FakeGist:
+    """In-memory gist with GitHub-like GET/PATCH plus injectable latency, errors and rate limits."""
+
+    def __init__(self, files: Dict[str, str], latency: float = 0.0, jitter: float = 0.0,
+                 error_rate: float = 0.0, rate_limit: int = 0, rate_window: float = 60.0, seed: int = 0, fail_first: int = 0):
+        self.files = dict(files)
+        self.latency, self.jitter = latency, jitter
+        self.error_rate = error_rate
+        self.fail_first = fail_first  # answer the next N requests with 500 (an outage at startup)
+        self.rate_limit, self.rate_window = rate_limit, rate_window
+        self.calls: Counter = Counter()  # (method, status) -> count
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._window_start = time.monotonic(); self._window_used = 0
+        self.server: Optional[ThreadingHTTPServer] = None
+
+    # -- request policy --
+    def _admit(self) -> int:
+        """Return the HTTP status to answer with before touching state (200 = proceed)."""
+        with self._lock:
+            if self.rate_limit:
+                now = time.monotonic()
+                if now - self._window_start >= self.rate_window:
+                    self._window_start = now; self._window_used = 0
+                if self._window_used >= self.rate_limit:
+                    return 403
+                self._window_used += 1
+            if self.fail_first:
+                self.fail_first -= 1; return 500
+            if self.error_rate and self._rng.random() < self.error_rate:
+                return 500
+            delay = self.latency + (self._rng.uniform(0, self.jitter) if self.jitter else 0.0)
+        if delay:
+            time.sleep(delay)
+        return 200
+
+    def _record(self, method: str, status: int):
+        with self._lock:
+            self.calls[(method, status)] += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"id": GIST_ID, "files": {n: {"filename": n, "content": c, "truncated": False} for n, c in self.files.items()}}
+
+    def patch(self, body: Dict[str, Any]):
+        with self._lock:
+            for name, spec in (body.get("files") or {}).items():
+                if spec is None:
+                    self.files.pop(name, None)
+                else:
+                    self.files[name] = spec.get("content", "")
+
+    # -- server lifecycle --
+    def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        self.server = ThreadingHTTPServer((host, port), _make_handler(self))
+        self.server.daemon_threads = True
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return f"http://{host}:{self.server.server_address[1]}"
+
+    def stop(self):
+        if self.server:
+            self.server.shutdown(); self.server.server_close()
+
+def _make_handler(gist: FakeGist):
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def _reply(self, status: int, payload: Dict[str, Any]):
+            raw = json.dumps(payload).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(raw)))
+            if status == 403:
+                self.send_header("X-RateLimit-Remaining", "0")
+            self.end_headers()
+            self.wfile.write(raw)
+
+        def _handle(self, method: str):
+            if self.path.rstrip("/") != f"/gists/{GIST_ID}":
+                gist._record(method, 404); return self._reply(404, {"message": "Not Found"})
+            body = {}
+            if method == "PATCH":
+                length = int(self.headers.get("Content-Length") or 0)
+                body = json.loads(self.rfile.read(length) or b"{}")
+            status = gist._admit()
+            gist._record(method, status)
+            if status == 403:
+                return self._reply(403, {"message": "API rate limit exceeded"})
+            if status != 200:
+                return self._reply(status, {"message": "Server Error"})
+            if method == "PATCH":
+                gist.patch(body)
+            self._reply(200, gist.snapshot())
+
+        def do_GET(self):
+            self._handle("GET")
+
+        def do_PATCH(self):
+            self._handle("PATCH")
+    return Handler
+
+# ---------------- Simulated sessions ----------------
+def _deep_size(obj, seen=None) -> int:
+    seen = set() if seen is None else seen
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(_deep_size(k, seen) + _deep_size(v, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(_deep_size(x, seen) for x in obj)
+    elif hasattr(obj, "__slots__"):
+        size += sum(_deep_size(getattr(obj, s), seen) for s in obj.__slots__ if hasattr(obj, s))
+    elif hasattr(obj, "__dict__"):
+        size += _deep_size(vars(obj), seen)
+    return size
+
+def _timed(at, fn) -> float:
+    t0 = time.perf_counter(); fn(); at.run(); return time.perf_counter() - t0
+
+SESSION_STATE_KEYS = ("data", "synced", "game_index")  # everything the app keeps per session
+
+def _share_server_state(secrets: Dict[str, str]):
+    """Give every AppTest what one Streamlit server shares between its sessions.
+
+    AppTest assumes one run at a time: around each run it swaps in st.secrets, a Runtime singleton and a
+    patched config, then resets them, and it compiles the script with a fresh cache. Install those once
+    instead so runs on several threads can overlap. Call warm_up() before starting the threads.
+    """
+    import contextlib
+    import streamlit as st
+    from streamlit import config
+    from streamlit.runtime import Runtime
+    from streamlit.runtime.secrets import Secrets
+    from streamlit.runtime.scriptrunner.script_cache import ScriptCache
+    from streamlit.testing.v1 import app_test, local_script_runner
+    from streamlit.testing.v1.util import build_mock_config_get_option
+    shared = Secrets(); shared._secrets = dict(secrets); st.secrets = shared
+    cache = ScriptCache(); local_script_runner.ScriptCache = lambda: cache
+    config.get_option = build_mock_config_get_option({"global.appTest": True})
+    app_test.patch_config_options = lambda overrides: contextlib.nullcontext()
+    seen: Dict[str, Any] = {}
+    def instance(cls):  # a run ending on another thread resets Runtime._instance; keep serving the last one
+        if cls._instance is not None: seen["runtime"] = cls._instance
+        if "runtime" not in seen: raise RuntimeError("Runtime hasn't been created!")
+        return seen["runtime"]
+    Runtime.instance = classmethod(instance)
+    Runtime.exists = classmethod(lambda cls: cls._instance is not None or "runtime" in seen)
+
+def warm_up():
+    """One throwaway run on this thread: compiles the script into the shared cache and records a Runtime."""
+    from streamlit.testing.v1 import AppTest
+    AppTest.from_file(APP_PATH, default_timeout=120).run()
+
+def run_session(args: Dict[str, Any]) -> Dict[str, Any]:
+    """One simulated user: load the app, then perform `ops` reads / W-L entries on its player.
+
+    A session whose initial load came back empty adds its player to the roster first (as a real user
+    would), so an overwrite of the gist from that empty copy shows up as lost seeded players.
+    """
+    from streamlit.testing.v1 import AppTest
+    rng = random.Random(args["seed"])
+    at = AppTest.from_file(APP_PATH, default_timeout=120)
+    latencies = [_timed(at, lambda: None)]
+    player = args["player"]
+    acked, local_only, added = [], 0, False
+    empty_load = not at.session_state["data"].players if "data" in at.session_state else True
+    for _ in range(args["ops"]):
+        time.sleep(args["think"])
+        if rng.random() < args["write_ratio"]:
+            if player not in [p.name for p in at.session_state["data"].players]:
+                latencies.append(_timed(at, lambda: at.text_input(key="name_add").input(player)))
+                latencies.append(_timed(at, lambda: at.button(key="btn_save_player").click()))
+                added = True
+                continue
+            latencies.append(_timed(at, lambda: at.selectbox(key="sel_record").select(player)))
+            result = rng.choice("WL")
+            latencies.append(_timed(at, lambda: at.button(key="btn_add_win" if result == "W" else "btn_add_loss").click()))
+            toasts = [t.value for t in at.toast]
+            if "Saved" in toasts:
+                acked.append(result)
+            else:
+                local_only += 1
+        elif at.session_state["data"].players:
+            names = [p.name for p in at.session_state["data"].players]
+            latencies.append(_timed(at, lambda: at.selectbox(key="player_detail").select(rng.choice(names))))
+        else:
+            latencies.append(_timed(at, lambda: None))
+    errors = [e.value for e in at.exception]
+    held = [at.session_state[k] for k in SESSION_STATE_KEYS if k in at.session_state]
+    return {"player": player, "latencies": latencies, "acked": acked, "local_only": local_only, "empty_load": empty_load,
+            "added_player": added, "mem_bytes": _deep_size(held), "errors": errors}
+
+# ---------------- Report ----------------
+def _pct(xs: List[float], q: float) -> float:
+    if not xs:
+        return 0.0
+    xs = sorted(xs); k = max(0, min(len(xs) - 1, int(round(q * (len(xs) - 1)))))
+    return xs[k]
+
+def summarize(results: List[Dict[str, Any]], gist: FakeGist, wall: float, seeded: List[str]) -> Dict[str, Any]:
+    lat = [x for r in results for x in r["latencies"]]
+    mem = [r["mem_bytes"] for r in results]
+    final = json.loads(gist.files.get("league.json") or "{}")
+    stored = {p.get("name", ""): len(p.get("results", [])) for p in final.get("players", [])}
+    acked_by_player: Counter = Counter()
+    for r in results:
+        acked_by_player[r["player"]] += len(r["acked"])
+    lost = sum(max(0, n - stored.get(name, 0)) for name, n in acked_by_player.items())
+    lost += sum(1 for name in seeded if name not in stored)  # roster wiped by a save from an empty copy
+    calls = {f"{m} {s}": n for (m, s), n in sorted(gist.calls.items())}
+    return {
+        "sessions": len(results),
+        "sessions_empty_load": sum(1 for r in results if r["empty_load"]),
+        "players_missing": sorted(set(seeded) - set(stored)),
+        "wall_s": round(wall, 2),
+        "reruns": len(lat),
+        "rerun_p50_ms": round(_pct(lat, 0.50) * 1000, 1),
+        "rerun_p95_ms": round(_pct(lat, 0.95) * 1000, 1),
+        "mem_per_session_kb_mean": round(statistics.mean(mem) / 1024, 1) if mem else 0.0,
+        "mem_per_session_kb_max": round(max(mem) / 1024, 1) if mem else 0.0,
+        "gist_calls": calls,
+        "gist_calls_total": sum(gist.calls.values()),
+        "writes_acked": sum(acked_by_player.values()),
+        "writes_local_only": sum(r["local_only"] for r in results),
+        "lost_updates": lost,
+        "app_errors": [e for r in results for e in r["errors"]],
+    }
+
+def seed_league(n_players: int) -> Dict[str, Any]:
+    players = [{"name": f"Player {i+1:02d}", "start_hc": 7 * (i % 5), "team": "", "results": []} for i in range(n_players)]
+    return {"players": players, "announcement": "", "announcements": [], "league_results": {}}
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    ap.add_argument("--sessions", type=int, default=4, help="concurrent simulated sessions (threads in this process)")
+    ap.add_argument("--ops", type=int, default=10, help="actions per session after the initial load")
+    ap.add_argument("--think", type=float, default=0.0, help="seconds each session waits between actions")
+    ap.add_argument("--write-ratio", type=float, default=0.3, help="fraction of actions that add a W/L")
+    ap.add_argument("--players", type=int, default=0, help="roster size (default: one player per session)")
+    ap.add_argument("--latency", type=float, default=0.05, help="fake Gist base latency in seconds")
+    ap.add_argument("--jitter", type=float, default=0.0, help="extra uniform random latency in seconds")
+    ap.add_argument("--error-rate", type=float, default=0.0, help="probability a Gist call returns 500")
+    ap.add_argument("--fail-first", type=int, default=0, help="fail the first N Gist calls with 500")
+    ap.add_argument("--rate-limit", type=int, default=0, help="max Gist calls per window (0 = unlimited)")
+    ap.add_argument("--rate-window", type=float, default=60.0, help="rate-limit window in seconds")
+    ap.add_argument("--seed", type=int, default=1)
+    ap.add_argument("--json", action="store_true", help="print the report as JSON")
+    a = ap.parse_args(argv)
+
+    n_players = a.players or a.sessions
+    league = seed_league(n_players)
+    names = [p["name"] for p in league["players"]]
+    gist = FakeGist({"league.json": json.dumps(league, indent=2)}, latency=a.latency, jitter=a.jitter,
+                    error_rate=a.error_rate, rate_limit=a.rate_limit, rate_window=a.rate_window, seed=a.seed,
+                    fail_first=a.fail_first)
+    api = gist.start()
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            cwd = os.getcwd(); os.chdir(tmp)  # the app's local files (league.json, journal) stay out of the repo, shared like on a server
+            _share_server_state({"GITHUB_TOKEN": "loadtest", "GIST_ID": GIST_ID, "GIST_API_URL": api})
+            gist.error_rate, gist.fail_first = 0.0, 0; warm_up(); gist.calls.clear()
+            gist.error_rate, gist.fail_first = a.error_rate, a.fail_first
+            jobs = [{"seed": a.seed * 1000 + i, "player": names[i % n_players], "ops": a.ops, "think": a.think, "write_ratio": a.write_ratio}
+                    for i in range(a.sessions)]
+            t0 = time.perf_counter()
+            try:
+                with ThreadPoolExecutor(a.sessions) as pool:
+                    results = list(pool.map(run_session, jobs))
+            finally:
+                os.chdir(cwd)
+            wall = time.perf_counter() - t0
+    finally:
+        gist.stop()
+
+    report = summarize(results, gist, wall, names)
+    if a.json:
+        print(json.dumps(report, indent=2))
+    else:
+        for k, v in report.items():
+            print(f"{k:>26}: {v}")
+    return 1 if report["app_errors"] else 0
+
+if __name__ == "__main__":
+    sys.exit(main())